@@ -0,0 +1,255 @@
+"""
+Online anomaly detection for the Car Rental Customer Feedback Analyzer
+Keeps constant-memory, time-decayed statistics per location and raises alerts when complaints spike
+"""
+
+import math
+import threading
+from collections import deque
+from datetime import date, datetime
+
+
+def review_day(value):
+    """Convert a review_date (string, date or timestamp) into a fractional day number, or None"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.toordinal() + (value.hour * 3600 + value.minute * 60 + value.second) / 86400
+    if isinstance(value, date):
+        return float(value.toordinal())
+    try:
+        return review_day(datetime.fromisoformat(str(value)))
+    except ValueError:
+        return None
+
+
+class EwmaStat:
+    """Fast and slow time-decayed averages of a single metric
+
+    Each review adds weight 1 and all accumulated weight halves every half-life of
+    review_date time, so a burst within a few days weighs far more in the fast average
+    than the same number of reviews spread over months.
+    """
+
+    __slots__ = ('fast_weight', 'fast_sum', 'fast_sum_sq', 'fast_weight_sq', 'slow_weight', 'slow_sum', 'slow_sum_sq')
+
+    def __init__(self):
+        self.fast_weight = self.fast_sum = self.fast_sum_sq = self.fast_weight_sq = 0.0
+        self.slow_weight = self.slow_sum = self.slow_sum_sq = 0.0
+
+    @property
+    def fast(self):
+        return self.fast_sum / self.fast_weight if self.fast_weight else None
+
+    @property
+    def baseline_weight(self):
+        return self.slow_weight - self.fast_weight
+
+    @property
+    def baseline(self):
+        """Average of older reviews only
+
+        Each review's slow weight is at least its fast weight (the fast one decays quicker), so
+        subtracting the fast sums leaves a valid weighted average in which today's reviews count
+        zero and older ones gradually more. A burst therefore cannot drag its own baseline up.
+        """
+        weight = self.baseline_weight
+        return (self.slow_sum - self.fast_sum) / weight if weight > 1e-9 else None
+
+    @property
+    def baseline_var(self):
+        weight = self.baseline_weight
+        if weight <= 1e-9:
+            return 0.0
+        return max((self.slow_sum_sq - self.fast_sum_sq) / weight - self.baseline ** 2, 0.0)
+
+    def decay(self, fast_factor, slow_factor):
+        """Age the accumulated weight by the time elapsed since the previous review"""
+        self.fast_weight *= fast_factor
+        self.fast_sum *= fast_factor
+        self.fast_sum_sq *= fast_factor
+        self.fast_weight_sq *= fast_factor * fast_factor
+        self.slow_weight *= slow_factor
+        self.slow_sum *= slow_factor
+        self.slow_sum_sq *= slow_factor
+
+    def update(self, value):
+        """Fold one observation into both averages"""
+        self.fast_weight += 1.0
+        self.fast_sum += value
+        self.fast_sum_sq += value * value
+        self.fast_weight_sq += 1.0
+        self.slow_weight += 1.0
+        self.slow_sum += value
+        self.slow_sum_sq += value * value
+
+    def z_score(self, min_std, min_delta=0.0, min_weight=1.0):
+        """How far the fast average has drifted above the older-review baseline, in standard errors"""
+        baseline = self.baseline
+        if self.fast_weight < min_weight or baseline is None or self.fast - baseline < min_delta:
+            return 0.0
+        # Standard error of a weighted mean over the fast window's effective number of reviews
+        effective_reviews = self.fast_weight ** 2 / self.fast_weight_sq
+        std = math.sqrt(max(self.baseline_var, min_std ** 2) / effective_reviews)
+        return (self.fast - baseline) / std
+
+
+class LocationState:
+    """Rolling statistics for a single location"""
+
+    __slots__ = ('count', 'last_date', 'last_day', 'negative', 'polarity', 'categories', 'alerting')
+
+    def __init__(self, feature_categories):
+        self.count = 0
+        self.last_date = None
+        self.last_day = None
+        self.negative = EwmaStat()
+        self.polarity = EwmaStat()
+        self.categories = {category: EwmaStat() for category in feature_categories}
+        self.alerting = set()
+
+
+class LocationAnomalyDetector:
+    """Detect sudden rises in negative share, polarity drops and category complaint spikes per location
+
+    Windows are measured in review_date time: the fast and slow averages lose half their
+    weight every fast_half_life_days / slow_half_life_days. Reviews dated before a location's
+    latest review (e.g. arriving out of order) are counted at that latest date. A metric only
+    alerts once the fast window holds min_recent_reviews worth of decayed weight, so a single
+    complaint at a quiet location is not a spike.
+    """
+
+    def __init__(self, feature_categories, fast_half_life_days=7, slow_half_life_days=90, z_threshold=3.0,
+                 min_reviews=20, min_recent_reviews=5, min_std=0.05, min_delta=0.25, max_alerts=500,
+                 on_alert=None):
+        self.feature_categories = list(feature_categories)
+        self.fast_half_life_days = fast_half_life_days
+        self.slow_half_life_days = slow_half_life_days
+        self.z_threshold = z_threshold
+        self.min_reviews = min_reviews
+        self.min_recent_reviews = min_recent_reviews
+        self.min_std = min_std
+        self.min_delta = min_delta
+        self.on_alert = on_alert
+        self.states = {}
+        self.recent_alerts = deque(maxlen=max_alerts)
+        self._lock = threading.Lock()
+
+    def set_feature_categories(self, feature_categories):
+        """Track complaint rates for a new set of categories, keeping statistics of unchanged ones"""
+        self.feature_categories = list(feature_categories)
+        metrics = {f'{category}_complaints' for category in self.feature_categories}
+
+        for state in self.states.values():
+            state.categories = {
+                category: state.categories.get(category) or EwmaStat() for category in self.feature_categories
+            }
+            state.alerting = {
+                metric for metric in state.alerting
+                if metric in metrics or not metric.endswith('_complaints')
+            }
+
+    def update(self, record):
+        """Fold one scored review into its location's statistics and return any new alerts"""
+        location = record.get('location') or 'Unknown'
+        state = self.states.get(location)
+        if state is None:
+            state = self.states[location] = LocationState(self.feature_categories)
+
+        is_negative = record['sentiment'] == 'Negative'
+        mentions = record.get('mentions') or {}
+
+        state.count += 1
+
+        # Decay by the review_date time elapsed since this location's latest review
+        day = review_day(record.get('review_date'))
+        if day is not None:
+            if state.last_day is not None and day > state.last_day:
+                elapsed = day - state.last_day
+                fast_factor = 0.5 ** (elapsed / self.fast_half_life_days)
+                slow_factor = 0.5 ** (elapsed / self.slow_half_life_days)
+                for stat in [state.negative, state.polarity] + list(state.categories.values()):
+                    stat.decay(fast_factor, slow_factor)
+            if state.last_day is None or day >= state.last_day:
+                state.last_day = day
+                state.last_date = record['review_date']
+
+        state.negative.update(1.0 if is_negative else 0.0)
+        # Negated so that a drop in polarity shows up as a positive z-score
+        state.polarity.update(-record['polarity'])
+        for category in self.feature_categories:
+            complained = 1.0 if is_negative and mentions.get(category) else 0.0
+            state.categories[category].update(complained)
+
+        if state.count < self.min_reviews:
+            return []
+
+        checks = [('negative_share', state.negative), ('mean_polarity', state.polarity)]
+        checks += [(f'{category}_complaints', state.categories[category]) for category in self.feature_categories]
+
+        alerts = []
+        for metric, stat in checks:
+            z_score = stat.z_score(self.min_std, self.min_delta, self.min_recent_reviews)
+
+            # Only alert when a metric crosses into the anomalous range, re-arm once it recovers
+            if z_score >= self.z_threshold:
+                if metric not in state.alerting:
+                    state.alerting.add(metric)
+                    sign = -1 if metric == 'mean_polarity' else 1
+                    alerts.append({
+                        'location': location,
+                        'review_date': str(state.last_date) if state.last_date is not None else None,
+                        'metric': metric,
+                        'current': round(sign * stat.fast, 4),
+                        'baseline': round(sign * stat.baseline, 4),
+                        'z_score': round(z_score, 2),
+                        'reviews_seen': state.count
+                    })
+            else:
+                state.alerting.discard(metric)
+
+        if alerts:
+            with self._lock:
+                self.recent_alerts.extend(alerts)
+            if self.on_alert is not None:
+                for alert in alerts:
+                    self.on_alert(alert)
+
+        return alerts
+
+    def process_batch(self, records):
+        """Update with a batch of scored records, suitable as a streaming ingestor listener"""
+        alerts = []
+        for record in records:
+            alerts.extend(self.update(record))
+        return alerts
+
+    def process_dataframe(self, df):
+        """Replay an analyzed review DataFrame in review_date order"""
+        if 'review_date' in df.columns:
+            df = df.sort_values('review_date', kind='stable')
+
+        mention_columns = [f'{category}_mentions' for category in self.feature_categories]
+        has_location = 'location' in df.columns
+        columns = ['sentiment', 'polarity', 'review_date'] + (['location'] if has_location else []) + mention_columns
+
+        first_mention = len(columns) - len(mention_columns)
+
+        alerts = []
+        for row in df[columns].itertuples(index=False, name=None):
+            record = {
+                'sentiment': row[0],
+                'polarity': row[1],
+                'review_date': row[2],
+                'location': row[3] if has_location else None,
+                'mentions': dict(zip(self.feature_categories, row[first_mention:]))
+            }
+            alerts.extend(self.update(record))
+        return alerts
+
+    def get_alerts(self, limit=None):
+        """Most recent alerts, newest first"""
+        with self._lock:
+            alerts = list(self.recent_alerts)
+        alerts.reverse()
+        return alerts[:limit] if limit else alerts
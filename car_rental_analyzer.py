@@ -12,13 +12,32 @@ from plotly.subplots import make_subplots
 import streamlit as st
 from datetime import datetime, timedelta
 import json
+import hashlib
+import io
 import os
+import sys
+from anomaly_detection import LocationAnomalyDetector
+from feature_taxonomy import changed_categories, get_matcher, load_taxonomy_file
+from report_export import ReportExporter
 
 class CarRentalFeedbackAnalyzer:
-    def __init__(self):
+    def __init__(self, memory_optimized=False, taxonomy_path=None):
         self.df = None
         self.sentiment_results = None
         self.feature_extraction_results = None
+        self.memory_optimized = memory_optimized
+        self.memory_optimization_results = None
+        self.anomaly_alerts = None
+        
+        # Caches derived from the loaded dataset, reset by load_data
+        self._dataset_hash = None
+        self._issue_counter_cache = {}
+        
+        # Optional file-based taxonomy, compiled into a cached matcher
+        self.taxonomy = None
+        self.taxonomy_path = None
+        self.feature_matcher = None
+        self._taxonomy_mtime = None
         
         # Define key features/categories to extract
         self.feature_categories = {
@@ -29,12 +48,94 @@ class CarRentalFeedbackAnalyzer:
             'booking_process': ['booking', 'reservation', 'website', 'app', 'easy', 'difficult', 'confusing'],
             'car_performance': ['engine', 'brake', 'air conditioning', 'radio', 'gps', 'fuel', 'performance']
         }
+        
+        # Common stop words ignored when counting issue terms
+        self.stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'was', 'were', 'are', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'this', 'that', 'these', 'those'}
+        
+        if taxonomy_path is not None:
+            self.load_taxonomy(taxonomy_path)
+    
+    def _apply_taxonomy(self, taxonomy):
+        """Switch feature matching over to a normalized taxonomy"""
+        self.taxonomy = taxonomy
+        self.feature_matcher = get_matcher(taxonomy)
+        self.feature_categories = {
+            category: spec['phrases'] + spec['stems'] for category, spec in taxonomy.items()
+        }
+    
+    def load_taxonomy(self, file_path):
+        """Load feature categories from a YAML/JSON taxonomy file"""
+        try:
+            taxonomy = load_taxonomy_file(file_path)
+            self._taxonomy_mtime = os.path.getmtime(file_path)
+            self.taxonomy_path = file_path
+            self._apply_taxonomy(taxonomy)
+            return True
+        except Exception as e:
+            st.error(f"Error loading taxonomy: {str(e)}")
+            return False
     
-    def load_data(self, file_path):
-        """Load customer feedback data from CSV file"""
+    def reload_taxonomy(self):
+        """Reload the taxonomy file if it changed, recomputing only the affected feature columns
+        
+        Raises if the file cannot be read or parsed; the current taxonomy stays in place and the
+        file is retried on the next call.
+        """
+        if self.taxonomy_path is None:
+            return []
+        
+        mtime = os.path.getmtime(self.taxonomy_path)
+        if mtime == self._taxonomy_mtime:
+            return []
+        new_taxonomy = load_taxonomy_file(self.taxonomy_path)
+        
+        self._taxonomy_mtime = mtime
+        changed, removed = changed_categories(self.taxonomy, new_taxonomy)
+        if not changed and not removed:
+            return []
+        
+        self._apply_taxonomy(new_taxonomy)
+        
+        if self.df is not None and self.feature_extraction_results is not None:
+            for category in removed:
+                self.df = self.df.drop(columns=[f'{category}_mentions', f'{category}_count'], errors='ignore')
+                self.feature_extraction_results.pop(category, None)
+            if changed:
+                self._extract_categories(changed)
+            # Complaint alerts depend on the category columns
+            self.anomaly_alerts = None
+        
+        return changed + removed
+    
+    def reload_taxonomy_if_changed(self):
+        """Dashboard wrapper around reload_taxonomy that reports errors instead of raising"""
         try:
-            self.df = pd.read_csv(file_path)
-            self.df['review_date'] = pd.to_datetime(self.df['review_date'])
+            return self.reload_taxonomy()
+        except Exception as e:
+            st.error(f"Error reloading taxonomy: {str(e)}")
+            return []
+    
+    def load_data(self, source):
+        """Load customer feedback data from a CSV file path, file-like object or in-memory bytes"""
+        try:
+            # Raw buffers are wrapped in memory rather than spooled to disk
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                source = io.BytesIO(source)
+            elif hasattr(source, 'seek'):
+                source.seek(0)
+            
+            # Parse fully before replacing anything, so a failed load keeps the previous dataset intact
+            df = pd.read_csv(source)
+            df['review_date'] = pd.to_datetime(df['review_date'])
+            
+            self.df = df
+            # Results belong to the previous dataset
+            self.sentiment_results = None
+            self.feature_extraction_results = None
+            self.memory_optimization_results = None
+            self.anomaly_alerts = None
+            self._dataset_hash = None
+            self._issue_counter_cache = {}
             return True
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
@@ -56,6 +157,37 @@ class CarRentalFeedbackAnalyzer:
         
         return text
     
+    def classify_sentiment(self, polarity):
+        """Map a polarity score to a sentiment label"""
+        if polarity > 0.1:
+            return 'Positive'
+        elif polarity < -0.1:
+            return 'Negative'
+        return 'Neutral'
+    
+    def score_review(self, review):
+        """Score a single review, returning (sentiment, polarity, subjectivity)"""
+        blob = TextBlob(str(review))
+        polarity = blob.sentiment.polarity
+        subjectivity = blob.sentiment.subjectivity
+        
+        return self.classify_sentiment(polarity), polarity, subjectivity
+    
+    def match_features(self, review, categories=None):
+        """Return the keywords of each feature category mentioned in a single review"""
+        processed_review = self.preprocess_text(review)
+        
+        if self.feature_matcher is not None:
+            return self.feature_matcher.match(processed_review, categories)
+        
+        if categories is None:
+            categories = self.feature_categories
+        
+        return {
+            category: [keyword for keyword in self.feature_categories[category] if keyword in processed_review]
+            for category in categories
+        }
+    
     def analyze_sentiment(self):
         """Perform sentiment analysis on customer reviews"""
         if self.df is None:
@@ -66,23 +198,14 @@ class CarRentalFeedbackAnalyzer:
         subjectivities = []
         
         for review in self.df['review_text']:
-            blob = TextBlob(str(review))
-            polarity = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
-            
-            # Classify sentiment
-            if polarity > 0.1:
-                sentiment = 'Positive'
-            elif polarity < -0.1:
-                sentiment = 'Negative'
-            else:
-                sentiment = 'Neutral'
+            sentiment, polarity, subjectivity = self.score_review(review)
             
             sentiments.append(sentiment)
             polarities.append(polarity)
             subjectivities.append(subjectivity)
         
         self.df['sentiment'] = sentiments
+        self._issue_counter_cache = {}
         self.df['polarity'] = polarities
         self.df['subjectivity'] = subjectivities
         
@@ -102,27 +225,28 @@ class CarRentalFeedbackAnalyzer:
         if self.df is None:
             return None
         
-        feature_mentions = {category: [] for category in self.feature_categories}
+        self.feature_extraction_results = {}
+        self._extract_categories(list(self.feature_categories))
+        
+        return self.feature_extraction_results
+    
+    def _extract_categories(self, categories):
+        """Compute mention columns and statistics for the given feature categories"""
+        feature_mentions = {category: [] for category in categories}
         
-        for idx, review in enumerate(self.df['review_text']):
-            processed_review = self.preprocess_text(review)
+        for review in self.df['review_text']:
+            review_mentions = self.match_features(review, categories)
             
-            for category, keywords in self.feature_categories.items():
-                mentions = []
-                for keyword in keywords:
-                    if keyword in processed_review:
-                        mentions.append(keyword)
-                
-                feature_mentions[category].append(mentions)
+            for category in categories:
+                feature_mentions[category].append(review_mentions[category])
         
         # Add feature mentions to dataframe
-        for category in self.feature_categories:
+        for category in categories:
             self.df[f'{category}_mentions'] = feature_mentions[category]
             self.df[f'{category}_count'] = [len(mentions) for mentions in feature_mentions[category]]
         
         # Calculate feature statistics
-        self.feature_extraction_results = {}
-        for category in self.feature_categories:
+        for category in categories:
             total_mentions = sum(self.df[f'{category}_count'])
             avg_mentions = np.mean(self.df[f'{category}_count'])
             
@@ -131,32 +255,117 @@ class CarRentalFeedbackAnalyzer:
                 'avg_mentions_per_review': avg_mentions,
                 'reviews_mentioning': len([count for count in self.df[f'{category}_count'] if count > 0])
             }
+    
+    def detect_location_anomalies(self):
+        """Replay the analyzed reviews through a location anomaly detector, keeping the alerts"""
+        if self.df is None or self.feature_extraction_results is None:
+            return None
         
-        return self.feature_extraction_results
+        detector = LocationAnomalyDetector(self.feature_categories)
+        detector.process_dataframe(self.df)
+        self.anomaly_alerts = detector.get_alerts()
+        
+        return self.anomaly_alerts
     
-    def identify_common_issues(self, top_n=10):
-        """Identify most common issues from negative reviews"""
+    def dataset_hash(self):
+        """Content hash of the loaded reviews, used to key cached renders"""
         if self.df is None:
             return None
         
-        negative_reviews = self.df[self.df['sentiment'] == 'Negative']
+        if self._dataset_hash is None:
+            columns = [column for column in ['review_text', 'review_date', 'location'] if column in self.df.columns]
+            row_hashes = pd.util.hash_pandas_object(self.df[columns].astype(str), index=False)
+            self._dataset_hash = hashlib.sha256(row_hashes.values.tobytes()).hexdigest()
         
-        # Extract common words/phrases from negative reviews
-        all_negative_text = ' '.join(negative_reviews['review_text'].astype(str))
-        processed_text = self.preprocess_text(all_negative_text)
+        return self._dataset_hash
+    
+    def filter_reviews(self, location=None, start_date=None, end_date=None):
+        """Return the reviews for a location and/or inclusive review_date range"""
+        if self.df is None:
+            return None
         
-        # Split into words and count frequency
-        words = processed_text.split()
+        mask = pd.Series(True, index=self.df.index)
+        if location is not None:
+            mask &= self.df['location'] == location
+        if start_date is not None:
+            mask &= self.df['review_date'] >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= self.df['review_date'] < pd.Timestamp(end_date) + pd.Timedelta(days=1)
         
-        # Filter out common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'was', 'were', 'are', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'this', 'that', 'these', 'those'}
+        return self.df[mask]
+    
+    def _issue_buckets(self, ngram=1):
+        """Term counters for negative reviews per (location, review day), computed once per dataset and n-gram size
+        
+        Each bucket also keeps the row position where a term first appeared, so summed buckets can be put
+        back in first-occurrence order and most_common breaks ties the same way as counting review by review.
+        """
+        if ngram not in self._issue_counter_cache:
+            buckets = {}
+            negative_reviews = self.df[self.df['sentiment'] == 'Negative']
+            locations = negative_reviews['location'] if 'location' in negative_reviews.columns else [None] * len(negative_reviews)
+            days = negative_reviews['review_date'].dt.normalize()
+            
+            for position, (location, day, review) in enumerate(zip(locations, days, negative_reviews['review_text'].astype(str))):
+                words = self.preprocess_text(review).split()
+                grams = [
+                    ' '.join(words[i:i + ngram]) for i in range(len(words) - ngram + 1)
+                    if all(word not in self.stop_words and len(word) > 2 for word in words[i:i + ngram])
+                ]
+                
+                bucket = buckets.get((location, day))
+                if bucket is None:
+                    bucket = buckets[(location, day)] = (Counter(), {})
+                counts, first_seen = bucket
+                counts.update(grams)
+                for gram in grams:
+                    first_seen.setdefault(gram, position)
+            
+            self._issue_counter_cache[ngram] = buckets
         
-        filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
+        return self._issue_counter_cache[ngram]
+    
+    def issue_term_counts(self, location=None, start_date=None, end_date=None, ngram=1):
+        """Term (or n-gram) frequencies across negative reviews matching the filters (dates match whole days)"""
+        if self.df is None or 'sentiment' not in self.df.columns:
+            return Counter()
+        
+        start = pd.Timestamp(start_date) if start_date is not None else None
+        end = pd.Timestamp(end_date) + pd.Timedelta(days=1) if end_date is not None else None
+        
+        totals = Counter()
+        first_seen = {}
+        for (bucket_location, day), (counts, positions) in self._issue_buckets(ngram).items():
+            if location is not None and bucket_location != location:
+                continue
+            if (start is not None and not day >= start) or (end is not None and not day < end):
+                continue
+            
+            totals.update(counts)
+            for term, position in positions.items():
+                if position < first_seen.get(term, position + 1):
+                    first_seen[term] = position
         
-        # Count word frequency
-        word_counts = Counter(filtered_words)
+        return Counter({term: totals[term] for term in sorted(first_seen, key=first_seen.get)})
+    
+    def identify_common_issues(self, top_n=10):
+        """Identify most common issues from negative reviews"""
+        if self.df is None:
+            return None
         
-        return word_counts.most_common(top_n)
+        return self.issue_term_counts().most_common(top_n)
+    
+    def create_issue_wordcloud(self, frequencies, width=800, height=400):
+        """Render a word cloud from term frequencies, returning PNG bytes"""
+        if not frequencies:
+            return None
+        
+        wordcloud = WordCloud(width=width, height=height, background_color='white', colormap='Reds')
+        wordcloud.generate_from_frequencies(dict(frequencies))
+        
+        buffer = io.BytesIO()
+        wordcloud.to_image().save(buffer, format='PNG')
+        return buffer.getvalue()
     
     def generate_performance_summary(self):
         """Generate comprehensive performance summary"""
@@ -202,6 +411,137 @@ class CarRentalFeedbackAnalyzer:
         
         return summary
     
+    def _shared_object_bytes(self, series):
+        """Bytes held by an object column, counting objects shared between rows only once"""
+        total = int(series.memory_usage(index=False, deep=False))
+        seen = set()
+        
+        for value in series:
+            if id(value) in seen:
+                continue
+            seen.add(id(value))
+            total += sys.getsizeof(value)
+            
+            if isinstance(value, (list, tuple)):
+                for item in value:
+                    if id(item) not in seen:
+                        seen.add(id(item))
+                        total += sys.getsizeof(item)
+        
+        return total
+    
+    def memory_report(self):
+        """Report the in-memory size of each DataFrame column in bytes"""
+        if self.df is None:
+            return None
+        
+        column_bytes = self.df.memory_usage(deep=True, index=False).to_dict()
+        
+        # pandas' deep measure counts a shared mention list once per row, so measure unique objects instead
+        for category in self.feature_categories:
+            column = f'{category}_mentions'
+            if column in self.df.columns:
+                column_bytes[column] = self._shared_object_bytes(self.df[column])
+        
+        return {
+            'total_bytes': int(sum(column_bytes.values())),
+            'columns': {column: int(size) for column, size in column_bytes.items()}
+        }
+    
+    def _frame_statistics(self):
+        """Summary statistics recomputed from the DataFrame columns themselves"""
+        stats = {}
+        
+        if 'sentiment' in self.df.columns:
+            stats['sentiment_counts'] = {str(k): int(v) for k, v in self.df['sentiment'].astype(str).value_counts().items()}
+        for column in ['polarity', 'subjectivity', 'rating']:
+            if column in self.df.columns:
+                stats[f'{column}_mean'] = float(self.df[column].astype(np.float64).mean())
+        if 'rating' in self.df.columns:
+            stats['rating_distribution'] = {int(k): int(v) for k, v in self.df['rating'].value_counts().items()}
+        
+        for category in self.feature_categories:
+            if f'{category}_count' in self.df.columns:
+                counts = self.df[f'{category}_count']
+                stats[f'{category}_total_mentions'] = int(counts.astype(np.int64).sum())
+                stats[f'{category}_reviews_mentioning'] = int((counts > 0).sum())
+            if f'{category}_mentions' in self.df.columns:
+                stats[f'{category}_mention_lengths'] = int(self.df[f'{category}_mentions'].map(len).sum())
+        
+        return stats
+    
+    def _compare_statistics(self, before, after):
+        """Names of statistics that differ; score means only need to agree to float32 precision"""
+        differences = []
+        for key in before.keys() | after.keys():
+            old, new = before.get(key), after.get(key)
+            if isinstance(old, float) and isinstance(new, float):
+                # Scores lie in [-1, 1], so float32 rounding moves their means by at most ~6e-8
+                if not np.isclose(old, new, rtol=0, atol=1e-7):
+                    differences.append(key)
+            elif old != new:
+                differences.append(key)
+        return sorted(differences)
+    
+    def optimize_memory(self, arrow_strings=False, verify=True):
+        """Shrink the DataFrame with compact dtypes, returning a before/after memory report"""
+        if self.df is None:
+            return None
+        
+        before = self.memory_report()
+        if verify:
+            summary_before = self.generate_performance_summary()
+            stats_before = self._frame_statistics()
+        
+        # Low-cardinality / repeated labels become categoricals
+        for column in ['location', 'sentiment', 'customer_id']:
+            if column in self.df.columns:
+                self.df[column] = self.df[column].astype('category')
+        
+        # Scores do not need double precision
+        for column in ['polarity', 'subjectivity']:
+            if column in self.df.columns:
+                self.df[column] = self.df[column].astype(np.float32)
+        
+        # Ratings and mention counts fit in the smallest unsigned integer type
+        count_columns = ['rating'] + [f'{category}_count' for category in self.feature_categories]
+        for column in count_columns:
+            if column in self.df.columns and pd.api.types.is_integer_dtype(self.df[column]) and self.df[column].min() >= 0:
+                self.df[column] = pd.to_numeric(self.df[column], downcast='unsigned')
+        
+        # Share one tuple object between all rows with the same mentions instead of a list per row
+        for category in self.feature_categories:
+            column = f'{category}_mentions'
+            if column in self.df.columns:
+                interned = {}
+                self.df[column] = [interned.setdefault(tuple(mentions), tuple(mentions)) for mentions in self.df[column]]
+        
+        if arrow_strings:
+            try:
+                import pyarrow  # noqa: F401
+                self.df['review_text'] = self.df['review_text'].astype('string[pyarrow]')
+            except ImportError:
+                st.warning("pyarrow is not installed, keeping review text as Python strings.")
+        
+        after = self.memory_report()
+        report = {
+            'before': before,
+            'after': after,
+            'saved_bytes': before['total_bytes'] - after['total_bytes'],
+            'reduction_pct': (1 - after['total_bytes'] / before['total_bytes']) * 100 if before['total_bytes'] else 0.0
+        }
+        
+        if verify:
+            # The summary reads cached results, so also recompute statistics from the converted columns
+            differences = self._compare_statistics(stats_before, self._frame_statistics())
+            if summary_before != self.generate_performance_summary():
+                differences.append('performance_summary')
+            report['summary_differences'] = differences
+            report['summary_unchanged'] = not differences
+        
+        self.memory_optimization_results = report
+        return report
+    
     def create_visualizations(self):
         """Create various visualizations for the analysis"""
         if self.df is None:
@@ -265,42 +605,161 @@ class CarRentalFeedbackAnalyzer:
         
         return fig
     
-    def save_report(self, filename="car_rental_analysis_report.json"):
+    def save_report(self, filename="car_rental_analysis_report.json", summary=None, indent=2):
         """Save analysis results to JSON file"""
         if self.df is None:
             return False
         
-        summary = self.generate_performance_summary()
-        
-        # Convert numpy types to native Python types for JSON serialization
-        def convert_numpy_types(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            return obj
-        
-        # Clean summary for JSON serialization
-        json_summary = json.loads(json.dumps(summary, default=convert_numpy_types))
-        
-        report = {
-            'analysis_date': datetime.now().isoformat(),
-            'summary': json_summary,
-            'detailed_results': {
-                'sentiment_analysis': self.sentiment_results,
-                'feature_extraction': self.feature_extraction_results
-            }
-        }
-        
         try:
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=2, default=convert_numpy_types)
+            ReportExporter(self).write_report_json(filename, summary=summary, indent=indent)
             return True
         except Exception as e:
             st.error(f"Error saving report: {str(e)}")
             return False
+    
+    def export_results(self, base_path="car_rental_analysis", fmt='ndjson', compression=None, summary=None):
+        """Export the summary and per-review enriched records"""
+        if self.df is None:
+            return None
+        
+        try:
+            return ReportExporter(self).export(base_path, fmt=fmt, compression=compression, summary=summary)
+        except Exception as e:
+            st.error(f"Error exporting results: {str(e)}")
+            return None
+
+def release_live_ingestor(resource):
+    """Stop an ingestor evicted from the live ingestor cache"""
+    ingestor, _ = resource
+    ingestor.stop(wait=False)
+
+# Only a couple of watch directories are kept live; evicted ingestors stop polling
+@st.cache_resource(max_entries=2, on_release=release_live_ingestor)
+def get_live_ingestor(watch_dir, taxonomy_path=None):
+    """Start (once per directory) a background ingestor that tails new review files"""
+    from streaming_ingestion import StreamingFeedbackIngestor
+    
+    ingestor = StreamingFeedbackIngestor(watch_dir, analyzer=CarRentalFeedbackAnalyzer(taxonomy_path=taxonomy_path))
+    detector = LocationAnomalyDetector(ingestor.analyzer.feature_categories)
+    ingestor.add_listener(detector.process_batch)
+    ingestor.add_taxonomy_listener(detector.set_feature_categories)
+    ingestor.start_background()
+    return ingestor, detector
+
+def render_anomaly_alerts(alerts):
+    """Display location anomaly alerts as a table"""
+    if alerts:
+        st.dataframe(pd.DataFrame(alerts), use_container_width=True)
+    else:
+        st.write("No anomalies detected.")
+
+@st.fragment(run_every="2s")
+def render_live_feed(ingestor, detector):
+    """Display the running summary and anomaly alerts of a streaming ingestor, refreshing every few seconds"""
+    st.header("📡 Live Feed")
+    
+    # The cached ingestor outlives its thread if the loop crashes, so surface that and restart it
+    if not ingestor.is_running():
+        st.error(f"Live ingestion stopped ({ingestor.last_error or 'unknown error'}), restarting...")
+        ingestor.start_background()
+    elif ingestor.last_error:
+        st.warning(f"Last ingestion error: {ingestor.last_error}")
+    
+    summary = ingestor.summary()
+    
+    if summary['total_reviews'] == 0:
+        st.info(f"Waiting for reviews in '{ingestor.watch_dir}'...")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Streamed Reviews", summary['total_reviews'])
+        with col2:
+            st.metric("Positive", summary['positive_count'])
+        with col3:
+            st.metric("Negative", summary['negative_count'])
+        with col4:
+            st.metric("Average Polarity", f"{summary['avg_polarity']:.3f}")
+        
+        feature_totals = sorted(
+            ((category, stats['total_mentions']) for category, stats in summary['feature_analysis'].items()),
+            key=lambda x: x[1], reverse=True
+        )
+        fig = go.Figure(go.Bar(
+            x=[category.replace('_', ' ').title() for category, _ in feature_totals],
+            y=[count for _, count in feature_totals]
+        ))
+        fig.update_layout(height=350, title_text="Streamed Feature Mentions")
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Last updated: {summary['last_updated']}")
+        
+        with st.expander("🚨 Location Anomaly Alerts", expanded=True):
+            render_anomaly_alerts(detector.get_alerts(limit=50))
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def render_issue_wordcloud(dataset_hash, location, start_date, end_date, _analyzer):
+    """Word cloud PNG for negative reviews, cached by dataset hash and filter"""
+    frequencies = _analyzer.issue_term_counts(location, start_date, end_date)
+    return _analyzer.create_issue_wordcloud(frequencies)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_top_ngrams(dataset_hash, location, start_date, end_date, ngram, top_n, _analyzer):
+    """Most common n-grams in negative reviews, cached by dataset hash and filter"""
+    return _analyzer.issue_term_counts(location, start_date, end_date, ngram=ngram).most_common(top_n)
+
+def render_issue_panel(analyzer):
+    """Display the filterable issue word cloud and n-gram bar chart"""
+    st.subheader("☁️ Issue Word Cloud")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        locations = sorted(analyzer.df['location'].dropna().unique()) if 'location' in analyzer.df.columns else []
+        location = st.selectbox("Location", ["All locations"] + list(locations))
+        location = None if location == "All locations" else location
+    with col2:
+        min_date = analyzer.df['review_date'].min().date()
+        max_date = analyzer.df['review_date'].max().date()
+        date_range = st.date_input("Date range", value=(min_date, max_date), min_value=min_date, max_value=max_date)
+    with col3:
+        ngram = st.radio("N-gram size", [1, 2, 3], index=1, horizontal=True)
+    
+    # Ignore the date filter until both ends of the range are picked
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        start_date, end_date = date_range
+    else:
+        start_date, end_date = min_date, max_date
+    if (start_date, end_date) == (min_date, max_date):
+        start_date = end_date = None
+    
+    dataset_hash = analyzer.dataset_hash()
+    col1, col2 = st.columns(2)
+    with col1:
+        image = render_issue_wordcloud(dataset_hash, location, start_date, end_date, analyzer)
+        if image:
+            st.image(image, use_container_width=True)
+        else:
+            st.write("No negative reviews match the selected filters.")
+    with col2:
+        top_ngrams = get_top_ngrams(dataset_hash, location, start_date, end_date, ngram, 15, analyzer)
+        if top_ngrams:
+            fig = go.Figure(go.Bar(
+                x=[count for _, count in top_ngrams][::-1],
+                y=[term for term, _ in top_ngrams][::-1],
+                orientation='h'
+            ))
+            fig.update_layout(height=400, title_text=f"Top {ngram}-grams in Negative Reviews")
+            st.plotly_chart(fig, use_container_width=True)
+
+def get_session_analyzer(memory_optimized, taxonomy_path):
+    """Return this browser session's analyzer, creating a fresh one when its settings change"""
+    config = (memory_optimized, taxonomy_path)
+    
+    # st.session_state is private to each session, so concurrent analysts never share data
+    if st.session_state.get('analyzer_config') != config:
+        st.session_state['analyzer'] = CarRentalFeedbackAnalyzer(memory_optimized=memory_optimized, taxonomy_path=taxonomy_path)
+        st.session_state['analyzer_config'] = config
+        st.session_state['data_source'] = None
+    
+    return st.session_state['analyzer']
 
 def main():
     st.set_page_config(page_title="Car Rental Feedback Analyzer", layout="wide")
@@ -309,7 +768,13 @@ def main():
     st.markdown("Analyze customer reviews to identify sentiment, key issues, and generate performance insights.")
     
     # Initialize analyzer
-    analyzer = CarRentalFeedbackAnalyzer()
+    memory_optimized = st.sidebar.checkbox("Memory-optimized mode", value=False)
+    taxonomy_path = st.sidebar.text_input("Feature taxonomy file (YAML/JSON, optional)", value="")
+    if taxonomy_path and not os.path.exists(taxonomy_path):
+        st.sidebar.error("Taxonomy file not found, using built-in feature categories.")
+        taxonomy_path = ""
+    analyzer = get_session_analyzer(memory_optimized, taxonomy_path or None)
+    analyzer.reload_taxonomy_if_changed()
     
     # Sidebar for file upload
     st.sidebar.header("Data Upload")
@@ -318,22 +783,28 @@ def main():
     # Sample data option
     if st.sidebar.button("Use Sample Data"):
         if os.path.exists("sample_car_rental_reviews.csv"):
-            analyzer.load_data("sample_car_rental_reviews.csv")
-            st.sidebar.success("Sample data loaded successfully!")
+            if analyzer.load_data("sample_car_rental_reviews.csv"):
+                st.session_state['data_source'] = "sample"
+                st.sidebar.success("Sample data loaded successfully!")
         else:
             st.sidebar.error("Sample data file not found. Please upload your own data.")
     
+    # Live directory ingestion option
+    st.sidebar.header("Live Ingestion")
+    watch_dir = st.sidebar.text_input("Directory to watch for .csv / .jsonl reviews", value="")
+    if watch_dir:
+        if os.path.isdir(watch_dir):
+            render_live_feed(*get_live_ingestor(watch_dir, taxonomy_path or None))
+        else:
+            st.sidebar.error("Watch directory not found.")
+    
     if uploaded_file is not None:
-        # Save uploaded file temporarily
-        with open("temp_reviews.csv", "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        
-        if analyzer.load_data("temp_reviews.csv"):
-            st.sidebar.success("Data loaded successfully!")
-        
-        # Clean up temporary file
-        if os.path.exists("temp_reviews.csv"):
-            os.remove("temp_reviews.csv")
+        # Only parse a given upload once per session; the upload is already an in-memory buffer
+        upload_id = getattr(uploaded_file, 'file_id', None) or (uploaded_file.name, uploaded_file.size)
+        if st.session_state.get('data_source') != upload_id:
+            if analyzer.load_data(uploaded_file):
+                st.session_state['data_source'] = upload_id
+                st.sidebar.success("Data loaded successfully!")
     
     # Main analysis section
     if analyzer.df is not None:
@@ -350,12 +821,38 @@ def main():
         with col4:
             st.metric("Unique Customers", analyzer.df['customer_id'].nunique())
         
-        # Perform analysis
-        with st.spinner("Analyzing sentiment..."):
-            sentiment_results = analyzer.analyze_sentiment()
-        
-        with st.spinner("Extracting features..."):
-            feature_results = analyzer.extract_features()
+        # Perform analysis (once per dataset, results persist in the session analyzer)
+        if analyzer.sentiment_results is None:
+            with st.spinner("Analyzing sentiment..."):
+                analyzer.analyze_sentiment()
+        sentiment_results = analyzer.sentiment_results
+        
+        if analyzer.feature_extraction_results is None:
+            with st.spinner("Extracting features..."):
+                analyzer.extract_features()
+        feature_results = analyzer.feature_extraction_results
+        
+        if analyzer.memory_optimized:
+            if analyzer.memory_optimization_results is None:
+                with st.spinner("Optimizing memory layout..."):
+                    analyzer.optimize_memory(arrow_strings=True)
+            memory_results = analyzer.memory_optimization_results
+            
+            with st.expander("💾 Memory Usage"):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Before", f"{memory_results['before']['total_bytes'] / 1024 ** 2:.2f} MB")
+                with col2:
+                    st.metric("After", f"{memory_results['after']['total_bytes'] / 1024 ** 2:.2f} MB")
+                with col3:
+                    st.metric("Reduction", f"{memory_results['reduction_pct']:.1f}%")
+                
+                st.dataframe(pd.DataFrame({
+                    'before_bytes': memory_results['before']['columns'],
+                    'after_bytes': memory_results['after']['columns']
+                }))
+                if not memory_results['summary_unchanged']:
+                    st.warning(f"Summary statistics changed after memory optimization: {', '.join(memory_results['summary_differences'])}")
         
         # Display results
         if sentiment_results and feature_results:
@@ -379,6 +876,8 @@ def main():
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             
+            render_issue_panel(analyzer)
+            
             # Performance Summary
             st.subheader("📋 Performance Summary")
             summary = analyzer.generate_performance_summary()
@@ -407,12 +906,34 @@ def main():
                     for feature, count in summary['most_mentioned_features']:
                         st.write(f"**{feature.replace('_', ' ').title()}:** {count} mentions")
                 
+                with st.expander("🚨 Location Anomalies"):
+                    if analyzer.anomaly_alerts is None:
+                        analyzer.detect_location_anomalies()
+                    render_anomaly_alerts(analyzer.anomaly_alerts)
+                
                 # Save report button
                 if st.button("💾 Save Analysis Report"):
-                    if analyzer.save_report():
+                    if analyzer.save_report(summary=summary):
                         st.success("Report saved as 'car_rental_analysis_report.json'")
                     else:
                         st.error("Failed to save report")
+                
+                # Per-review export
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    export_format = st.selectbox("Export format", ['ndjson', 'csv', 'parquet'])
+                with col2:
+                    compression_options = ['snappy', 'gzip', 'zstd'] if export_format == 'parquet' else ['none', 'gzip', 'bz2', 'xz']
+                    export_compression = st.selectbox("Compression", compression_options)
+                with col3:
+                    if st.button("📦 Export Per-Review Results"):
+                        exported = analyzer.export_results(
+                            fmt=export_format,
+                            compression=None if export_compression == 'none' else export_compression,
+                            summary=summary
+                        )
+                        if exported:
+                            st.success(f"Exported {exported['rows']} reviews to '{exported['reviews_path']}'")
         
         # Raw data view
         with st.expander("📄 View Raw Data"):
@@ -0,0 +1,136 @@
+"""
+Configurable feature taxonomy for the Car Rental Customer Feedback Analyzer
+Loads categories of phrases, stems and exclusions from YAML / JSON and compiles them into cached matchers
+"""
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+
+
+# Compiled matchers keyed by taxonomy hash, so identical taxonomies are only compiled once.
+# Kept as a small LRU so repeated hot reloads do not accumulate stale matchers.
+_MATCHER_CACHE = OrderedDict()
+MATCHER_CACHE_SIZE = 8
+
+
+def normalize_term(term):
+    """Normalize a taxonomy term the same way review text is preprocessed"""
+    term = re.sub(r'[^a-zA-Z0-9\s]', '', str(term).lower())
+    return ' '.join(term.split())
+
+
+def normalize_taxonomy(raw):
+    """Convert a raw taxonomy mapping into {category: {'phrases', 'stems', 'exclusions'}}"""
+    if isinstance(raw, dict) and 'categories' in raw:
+        raw = raw['categories']
+    if not isinstance(raw, dict):
+        raise ValueError("Taxonomy must be a mapping of category names to terms")
+
+    taxonomy = {}
+    for category, spec in raw.items():
+        # A bare list is shorthand for a category made only of phrases
+        if isinstance(spec, list):
+            spec = {'phrases': spec}
+        if not isinstance(spec, dict):
+            raise ValueError(f"Invalid definition for category '{category}'")
+
+        taxonomy[str(category)] = {
+            key: [term for term in (normalize_term(t) for t in spec.get(key) or []) if term]
+            for key in ('phrases', 'stems', 'exclusions')
+        }
+
+    return taxonomy
+
+
+def load_taxonomy_file(path):
+    """Read and normalize a taxonomy from a .yaml/.yml or .json file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required for YAML taxonomies: pip install pyyaml")
+            raw = yaml.safe_load(f)
+        else:
+            raw = json.load(f)
+
+    return normalize_taxonomy(raw)
+
+
+def taxonomy_hash(taxonomy):
+    """Stable hash of a whole taxonomy"""
+    return hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def changed_categories(old_taxonomy, new_taxonomy):
+    """Return (changed_or_added, removed) category names between two taxonomies"""
+    old_taxonomy = old_taxonomy or {}
+    changed = [category for category, spec in new_taxonomy.items() if old_taxonomy.get(category) != spec]
+    removed = [category for category in old_taxonomy if category not in new_taxonomy]
+    return changed, removed
+
+
+class CompiledTaxonomyMatcher:
+    """One precompiled regular expression per category"""
+
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self.hash = taxonomy_hash(taxonomy)
+        self._patterns = {}
+        self._exclusions = {}
+
+        for category, spec in taxonomy.items():
+            terms = spec['phrases'] + spec['stems']
+            if not terms:
+                continue
+
+            # Each term gets its own group so a match can be traced back to the taxonomy entry;
+            # longer terms go first so multi-word phrases win over their prefixes
+            alternatives = [(len(t), rf'\b({re.escape(t)})\b') for t in spec['phrases']]
+            alternatives += [(len(t), rf'\b({re.escape(t)})\w*') for t in spec['stems']]
+            order = sorted(range(len(terms)), key=lambda i: -alternatives[i][0])
+
+            self._patterns[category] = (
+                re.compile('|'.join(alternatives[i][1] for i in order)),
+                [terms[i] for i in order],
+                terms
+            )
+            if spec['exclusions']:
+                self._exclusions[category] = re.compile(
+                    '|'.join(rf'\b{re.escape(t)}\b' for t in sorted(spec['exclusions'], key=len, reverse=True))
+                )
+
+    def match(self, processed_review, categories=None):
+        """Return the taxonomy terms of each category found in a preprocessed review"""
+        results = {}
+        for category in categories if categories is not None else self.taxonomy:
+            compiled = self._patterns.get(category)
+            if compiled is None:
+                results[category] = []
+                continue
+
+            pattern, group_terms, terms = compiled
+            text = processed_review
+            exclusion = self._exclusions.get(category)
+            if exclusion is not None:
+                text = exclusion.sub(' ', text)
+
+            found = {group_terms[m.lastindex - 1] for m in pattern.finditer(text)}
+            results[category] = [term for term in terms if term in found]
+
+        return results
+
+
+def get_matcher(taxonomy):
+    """Return the cached compiled matcher for a taxonomy, compiling it on first use"""
+    key = taxonomy_hash(taxonomy)
+    matcher = _MATCHER_CACHE.get(key)
+    if matcher is None:
+        matcher = _MATCHER_CACHE[key] = CompiledTaxonomyMatcher(taxonomy)
+        while len(_MATCHER_CACHE) > MATCHER_CACHE_SIZE:
+            _MATCHER_CACHE.popitem(last=False)
+    else:
+        _MATCHER_CACHE.move_to_end(key)
+    return matcher
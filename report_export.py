@@ -0,0 +1,194 @@
+"""
+Report export for the Car Rental Customer Feedback Analyzer
+Writes the analysis summary and per-review enriched records as JSON, NDJSON, CSV or Parquet
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+from datetime import datetime
+
+import numpy as np
+
+
+COMPRESSION_OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open
+}
+
+COMPRESSION_EXTENSIONS = {
+    'gzip': '.gz',
+    'bz2': '.bz2',
+    'xz': '.xz'
+}
+
+FORMAT_EXTENSIONS = {
+    'ndjson': '.ndjson',
+    'csv': '.csv',
+    'parquet': '.parquet'
+}
+
+
+def convert_numpy_types(obj):
+    """Convert numpy types to native Python types for JSON serialization"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (datetime, np.datetime64)):
+        return str(obj)
+    return obj
+
+
+def infer_format(path):
+    """Guess the export format from a file name, ignoring any compression suffix"""
+    for extension in COMPRESSION_EXTENSIONS.values():
+        if path.endswith(extension):
+            path = path[:-len(extension)]
+            break
+
+    for fmt, extension in FORMAT_EXTENSIONS.items():
+        if path.endswith(extension):
+            return fmt
+    if path.endswith('.jsonl'):
+        return 'ndjson'
+
+    raise ValueError(f"Cannot infer export format from '{path}', pass fmt explicitly")
+
+
+def infer_compression(path):
+    """Guess the text compression codec from a file name"""
+    for compression, extension in COMPRESSION_EXTENSIONS.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def open_text_output(path, compression=None):
+    """Open a text file for writing, optionally through a compression codec"""
+    if compression is None:
+        return open(path, 'w', encoding='utf-8', newline='')
+    if compression not in COMPRESSION_OPENERS:
+        raise ValueError(f"Unsupported compression '{compression}', use one of {list(COMPRESSION_OPENERS)}")
+    return COMPRESSION_OPENERS[compression](path, 'wt', encoding='utf-8', newline='')
+
+
+class ReportExporter:
+    """Export already computed analysis results without re-running the analysis"""
+
+    def __init__(self, analyzer, chunk_size=50000):
+        self.analyzer = analyzer
+        self.chunk_size = chunk_size
+
+    def mention_columns(self):
+        """Names of the list-valued feature mention columns"""
+        return [f'{category}_mentions' for category in self.analyzer.feature_categories
+                if f'{category}_mentions' in self.analyzer.df.columns]
+
+    def build_report(self, summary=None):
+        """Assemble the report dict, reusing a summary the caller already has"""
+        if summary is None:
+            summary = self.analyzer.generate_performance_summary()
+
+        return {
+            'analysis_date': datetime.now().isoformat(),
+            'summary': summary,
+            'detailed_results': {
+                'sentiment_analysis': self.analyzer.sentiment_results,
+                'feature_extraction': self.analyzer.feature_extraction_results
+            }
+        }
+
+    def write_report_json(self, path, summary=None, indent=2, compression=None):
+        """Write the summary report as a single JSON document"""
+        report = self.build_report(summary)
+        with open_text_output(path, compression or infer_compression(path)) as f:
+            json.dump(report, f, indent=indent, default=convert_numpy_types)
+        return path
+
+    def iter_chunks(self):
+        """Yield the per-review records in row slices so exports never copy the whole frame"""
+        df = self.analyzer.df
+        for start in range(0, len(df), self.chunk_size):
+            yield df.iloc[start:start + self.chunk_size]
+
+    def export_reviews(self, path, fmt=None, compression=None):
+        """Write per-review enriched records incrementally, returning the number of rows written"""
+        fmt = fmt or infer_format(path)
+        if fmt == 'ndjson':
+            return self._write_ndjson(path, compression or infer_compression(path))
+        elif fmt == 'csv':
+            return self._write_csv(path, compression or infer_compression(path))
+        elif fmt == 'parquet':
+            return self._write_parquet(path, compression or 'snappy')
+        raise ValueError(f"Unsupported export format '{fmt}', use one of {list(FORMAT_EXTENSIONS)}")
+
+    def _write_ndjson(self, path, compression):
+        rows = 0
+        with open_text_output(path, compression) as f:
+            for chunk in self.iter_chunks():
+                if chunk.empty:
+                    continue
+                lines = chunk.to_json(orient='records', lines=True, date_format='iso', force_ascii=False)
+                # Newer pandas already terminates the last line; never emit blank lines between chunks
+                f.write(lines if lines.endswith('\n') else lines + '\n')
+                rows += len(chunk)
+        return rows
+
+    def _write_csv(self, path, compression):
+        rows = 0
+        mention_columns = self.mention_columns()
+        with open_text_output(path, compression) as f:
+            for chunk in self.iter_chunks():
+                # Flatten mention lists so each cell stays a plain string
+                chunk = chunk.assign(**{
+                    column: chunk[column].map(';'.join) for column in mention_columns
+                })
+                chunk.to_csv(f, header=rows == 0, index=False)
+                rows += len(chunk)
+        return rows
+
+    def _write_parquet(self, path, compression):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet export: pip install pyarrow")
+
+        rows = 0
+        writer = None
+        mention_columns = self.mention_columns()
+        try:
+            for chunk in self.iter_chunks():
+                chunk = chunk.assign(**{column: chunk[column].map(list) for column in mention_columns})
+
+                if writer is None:
+                    # Pin mention columns to list<string>; an all-empty first chunk would otherwise infer null
+                    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                    for column in mention_columns:
+                        schema = schema.set(schema.get_field_index(column), pa.field(column, pa.list_(pa.string())))
+                    writer = pq.ParquetWriter(path, schema, compression=compression)
+
+                # Each chunk becomes its own row group
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    def export(self, base_path, fmt='ndjson', compression=None, summary=None):
+        """Write '<base>.summary.json' and '<base>.reviews.<ext>', returning both paths and the row count"""
+        summary_path = f"{base_path}.summary.json"
+        reviews_path = f"{base_path}.reviews{FORMAT_EXTENSIONS[fmt]}"
+        if fmt != 'parquet' and compression:
+            reviews_path += COMPRESSION_EXTENSIONS[compression]
+
+        self.write_report_json(summary_path, summary=summary)
+        rows = self.export_reviews(reviews_path, fmt=fmt, compression=compression)
+
+        return {'summary_path': summary_path, 'reviews_path': reviews_path, 'rows': rows}
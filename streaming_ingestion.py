@@ -0,0 +1,414 @@
+"""
+Streaming ingestion for the Car Rental Customer Feedback Analyzer
+Tails a directory of CSV / JSONL review files and keeps running sentiment and feature aggregates up to date
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from car_rental_analyzer import CarRentalFeedbackAnalyzer
+
+
+logger = logging.getLogger(__name__)
+
+class RunningAggregates:
+    """Incrementally updated sentiment and feature statistics"""
+
+    def __init__(self, feature_categories, recent_size=200):
+        self._lock = threading.Lock()
+        self.feature_categories = list(feature_categories)
+        self.total_reviews = 0
+        self.sentiment_counts = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
+        self.polarity_sum = 0.0
+        self.subjectivity_sum = 0.0
+        self.rating_sum = 0.0
+        self.rating_count = 0
+        self.feature_totals = {category: 0 for category in self.feature_categories}
+        self.feature_reviews = {category: 0 for category in self.feature_categories}
+        self.recent_reviews = deque(maxlen=recent_size)
+        self.last_updated = None
+
+    def update(self, records):
+        """Fold a batch of scored records into the running totals"""
+        with self._lock:
+            for record in records:
+                self.total_reviews += 1
+                self.sentiment_counts[record['sentiment']] += 1
+                self.polarity_sum += record['polarity']
+                self.subjectivity_sum += record['subjectivity']
+
+                if record.get('rating') is not None:
+                    self.rating_sum += record['rating']
+                    self.rating_count += 1
+
+                for category, mentions in record['mentions'].items():
+                    self.feature_totals[category] = self.feature_totals.get(category, 0) + len(mentions)
+                    if mentions:
+                        self.feature_reviews[category] = self.feature_reviews.get(category, 0) + 1
+
+                self.recent_reviews.append(record)
+
+            self.last_updated = datetime.now()
+
+    def set_feature_categories(self, feature_categories):
+        """Report only these categories, e.g. after a taxonomy reload added or removed some"""
+        with self._lock:
+            self.feature_categories = list(feature_categories)
+
+    def summary(self):
+        """Return a snapshot shaped like the batch sentiment/feature results"""
+        with self._lock:
+            total = self.total_reviews
+            feature_analysis = {}
+            for category in self.feature_categories:
+                total_mentions = self.feature_totals.get(category, 0)
+                feature_analysis[category] = {
+                    'total_mentions': total_mentions,
+                    'avg_mentions_per_review': total_mentions / total if total else 0.0,
+                    'reviews_mentioning': self.feature_reviews.get(category, 0)
+                }
+
+            return {
+                'total_reviews': total,
+                'positive_count': self.sentiment_counts['Positive'],
+                'negative_count': self.sentiment_counts['Negative'],
+                'neutral_count': self.sentiment_counts['Neutral'],
+                'avg_polarity': self.polarity_sum / total if total else 0.0,
+                'avg_subjectivity': self.subjectivity_sum / total if total else 0.0,
+                'average_rating': self.rating_sum / self.rating_count if self.rating_count else None,
+                'feature_analysis': feature_analysis,
+                'last_updated': self.last_updated.isoformat() if self.last_updated else None
+            }
+
+
+class StreamingFeedbackIngestor:
+    """Watch a directory for CSV / JSONL review files and score new records as they arrive"""
+
+    def __init__(self, watch_dir, analyzer=None, batch_size=100, max_pending_batches=10,
+                 poll_interval=1.0, snapshot_path=None, max_read_bytes=1024 * 1024):
+        self.watch_dir = watch_dir
+        self.analyzer = analyzer or CarRentalFeedbackAnalyzer()
+        self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
+        self.poll_interval = poll_interval
+        self.snapshot_path = snapshot_path
+        self.max_read_bytes = max_read_bytes
+        self.aggregates = RunningAggregates(self.analyzer.feature_categories)
+
+        # Per-file offset of the last enqueued record and CSV header, so reads resume where they stopped
+        self._offsets = {}
+        self._csv_headers = {}
+        # Per-file (size, mtime, first time seen at that size/mtime), to tell finished files from growing ones
+        self._file_stats = {}
+        self._listeners = []
+        self._taxonomy_listeners = []
+        self.last_error = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        """Register a callback invoked with every scored batch"""
+        self._listeners.append(callback)
+
+    def add_taxonomy_listener(self, callback):
+        """Register a callback invoked with the new category names after a taxonomy reload"""
+        self._taxonomy_listeners.append(callback)
+
+    async def _reload_taxonomy(self, loop):
+        """Pick up taxonomy edits without restarting the stream"""
+        try:
+            changed = await loop.run_in_executor(None, self.analyzer.reload_taxonomy)
+        except Exception as e:
+            # A broken file is retried every pass until fixed, only log it once
+            if self.last_error != f"Error reloading taxonomy: {e}":
+                self._record_error("Error reloading taxonomy", e)
+            return
+        if not changed:
+            return
+
+        categories = list(self.analyzer.feature_categories)
+        self.aggregates.set_feature_categories(categories)
+        for callback in self._taxonomy_listeners:
+            try:
+                callback(categories)
+            except Exception as e:
+                self._record_error(f"Error in taxonomy listener {callback!r}", e)
+
+    def summary(self):
+        """Current running summary of everything ingested so far"""
+        return self.aggregates.summary()
+
+    def _record_boundaries(self, path, data):
+        """Byte offsets just past each complete record in a chunk"""
+        if path.endswith('.jsonl'):
+            return [m.end() for m in re.finditer(rb'\n', data)]
+
+        # A newline only ends a CSV record outside quotes; '"' and '\n' never occur inside
+        # multi-byte UTF-8 sequences, so quote state can be tracked on the raw bytes
+        boundaries = []
+        in_quotes = False
+        for m in re.finditer(rb'["\n]', data):
+            if m.group() == b'"':
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                boundaries.append(m.end())
+        return boundaries
+
+    def _read_records(self, path):
+        """Read at most max_read_bytes of complete records appended to a file
+
+        Returns a list of (record, end_offset) pairs; record is None for headers and
+        unparseable rows so that their bytes are still consumed. A final record without
+        a trailing newline is consumed once the file has stopped changing for a poll interval.
+        """
+        stat = os.stat(path)
+        size = stat.st_size
+        offset = self._offsets.get(path, 0)
+
+        previous = self._file_stats.get(path)
+        if previous is None or previous[:2] != (size, stat.st_mtime):
+            self._file_stats[path] = (size, stat.st_mtime, time.monotonic())
+            settled = False
+        else:
+            settled = time.monotonic() - previous[2] >= self.poll_interval
+
+        # File was truncated or replaced, start again from the top
+        if size < offset:
+            offset = self._offsets[path] = 0
+            self._csv_headers.pop(path, None)
+
+        if size == offset:
+            return []
+
+        limit = self.max_read_bytes
+        with open(path, 'rb') as f:
+            while True:
+                f.seek(offset)
+                data = f.read(min(limit, size - offset))
+                boundaries = self._record_boundaries(path, data)
+                # Grow the read only when a single record is larger than the cap
+                if boundaries or offset + len(data) >= size:
+                    break
+                limit *= 2
+
+        if not boundaries:
+            # A trailing partial record waits for more data while the file is still growing,
+            # but end-of-file closes it once the file has settled
+            if not settled or offset + len(data) < size or not data.strip():
+                return []
+            boundaries = [len(data)]
+
+        parsed = []
+        start = 0
+        if path.endswith('.jsonl'):
+            for end in boundaries:
+                line = data[start:end].decode('utf-8', errors='replace').strip()
+                record = None
+                if line:
+                    try:
+                        record = self._normalize(json.loads(line))
+                    except json.JSONDecodeError:
+                        pass
+                parsed.append((record, offset + end))
+                start = end
+        else:
+            text = data[:boundaries[-1]].decode('utf-8', errors='replace')
+            rows = csv.reader(io.StringIO(text, newline=''))
+            for row, end in zip(rows, boundaries):
+                record = None
+                if offset == 0 and start == 0:
+                    self._csv_headers[path] = row
+                elif row and path in self._csv_headers:
+                    record = self._normalize(dict(zip(self._csv_headers[path], row)))
+                parsed.append((record, offset + end))
+                start = end
+
+        return parsed
+
+    def _normalize(self, record):
+        """Coerce a raw record into the columns the analyzer expects"""
+        if not isinstance(record, dict) or not record.get('review_text'):
+            return None
+
+        try:
+            rating = float(record['rating']) if record.get('rating') not in (None, '') else None
+        except (TypeError, ValueError):
+            rating = None
+
+        return {
+            'customer_id': record.get('customer_id'),
+            'review_text': str(record['review_text']),
+            'rating': rating,
+            'review_date': record.get('review_date'),
+            'location': record.get('location')
+        }
+
+    def _watched_files(self):
+        """Paths of the review files currently in the watch directory"""
+        if not os.path.isdir(self.watch_dir):
+            return []
+
+        return [
+            os.path.join(self.watch_dir, name) for name in sorted(os.listdir(self.watch_dir))
+            if name.endswith(('.csv', '.jsonl'))
+        ]
+
+    def _score_batch(self, batch):
+        """Run sentiment and feature scoring over a batch of records"""
+        for record in batch:
+            sentiment, polarity, subjectivity = self.analyzer.score_review(record['review_text'])
+            record['sentiment'] = sentiment
+            record['polarity'] = polarity
+            record['subjectivity'] = subjectivity
+            record['mentions'] = self.analyzer.match_features(record['review_text'])
+        return batch
+
+    def _write_snapshot(self):
+        """Atomically write the running summary to the snapshot file"""
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def _watch(self, queue):
+        """Producer: read bounded chunks from each file and enqueue them batch by batch"""
+        loop = asyncio.get_running_loop()
+        while not self._stop_event.is_set():
+            progressed = False
+            await self._reload_taxonomy(loop)
+
+            # One chunk per file per pass so a large backlog in one file does not starve the rest
+            try:
+                paths = await loop.run_in_executor(None, self._watched_files)
+            except OSError as e:
+                self._record_error(f"Error listing {self.watch_dir}", e)
+                paths = []
+
+            for path in paths:
+                try:
+                    parsed = await loop.run_in_executor(None, self._read_records, path)
+                except Exception as e:
+                    self._record_error(f"Error reading {path}", e)
+                    continue
+
+                for start in range(0, len(parsed), self.batch_size):
+                    chunk = parsed[start:start + self.batch_size]
+                    batch = [record for record, _ in chunk if record is not None]
+                    if batch:
+                        # Blocks when the queue is full, so scoring applies backpressure to reading
+                        await queue.put(batch)
+                    self._offsets[path] = chunk[-1][1]
+                    progressed = True
+
+                if self._stop_event.is_set():
+                    break
+
+            if not progressed:
+                await asyncio.sleep(self.poll_interval)
+        await queue.put(None)
+
+    async def _consume(self, queue):
+        """Consumer: score batches and fold them into the running aggregates"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+
+            # A failing batch, listener or snapshot is logged and skipped, never fatal to the stream
+            try:
+                scored = await loop.run_in_executor(None, self._score_batch, batch)
+                self.aggregates.update(scored)
+            except Exception as e:
+                self._record_error("Error scoring batch", e)
+                continue
+
+            for callback in self._listeners:
+                try:
+                    callback(scored)
+                except Exception as e:
+                    self._record_error(f"Error in listener {callback!r}", e)
+
+            if self.snapshot_path:
+                try:
+                    await loop.run_in_executor(None, self._write_snapshot)
+                except Exception as e:
+                    self._record_error("Error writing snapshot", e)
+
+    def _record_error(self, message, error):
+        """Log an error and keep it for display"""
+        logger.exception(message)
+        self.last_error = f"{message}: {error}"
+
+    async def run(self):
+        """Run the watcher and scorer until stop() is called"""
+        self._stop_event.clear()
+        queue = asyncio.Queue(maxsize=self.max_pending_batches)
+        await asyncio.gather(self._watch(queue), self._consume(queue))
+
+    def _run_thread(self):
+        try:
+            asyncio.run(self.run())
+        except Exception as e:
+            self._record_error("Ingestion loop stopped", e)
+
+    def is_running(self):
+        """Whether the background ingestion thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_background(self):
+        """Run the ingestion loop in a daemon thread, restarting it if it has died"""
+        if self.is_running():
+            return self._thread
+
+        self._thread = threading.Thread(target=self._run_thread, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, wait=True):
+        """Signal the ingestion loop to finish after the current poll, optionally waiting for it"""
+        self._stop_event.set()
+        if self._thread is not None:
+            if wait:
+                self._thread.join()
+            self._thread = None
+
+
+def main():
+    """Tail a directory of review files and print the running summary"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream car rental reviews from a directory")
+    parser.add_argument('watch_dir', help="Directory containing .csv / .jsonl review files")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--snapshot', default=None, help="Path to write the running summary JSON")
+    args = parser.parse_args()
+
+    ingestor = StreamingFeedbackIngestor(args.watch_dir, batch_size=args.batch_size,
+                                         poll_interval=args.poll_interval, snapshot_path=args.snapshot)
+    ingestor.start_background()
+    print(f"Watching {args.watch_dir} for new reviews (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(5)
+            summary = ingestor.summary()
+            print(f"{summary['total_reviews']} reviews | "
+                  f"+{summary['positive_count']} / -{summary['negative_count']} / ={summary['neutral_count']} | "
+                  f"avg polarity {summary['avg_polarity']:.3f}")
+    except KeyboardInterrupt:
+        ingestor.stop()
+
+
+if __name__ == "__main__":
+    main()